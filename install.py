@@ -10,66 +10,235 @@ This script copies the command files to ~/.claude/commands/
 Cross-platform compatible (Windows, macOS, Linux)
 """
 
+import io
 import os
 import sys
+import errno
+import hashlib
 import shutil
 import subprocess
-import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# clonefile() is looked up once and shared by every copy thread (macOS APFS)
+_clonefile = None
+if sys.platform == 'darwin':
+    import ctypes
+    try:
+        _clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        pass
+
 # ANSI color codes
 GREEN = '\033[0;32m'
 BLUE = '\033[0;34m'
 YELLOW = '\033[1;33m'
 NC = '\033[0m'  # No Color
 
-def print_colored(text, color, end="\n"):
+# Banner rules for the installation header and footer
+BANNER45 = "=" * 45
+BANNER50 = "=" * 50
+
+# Buffer size used when streaming command files to their destination
+COPY_BUFSIZE = 1024 * 1024
+
+# Skip re-pulling if the last successful update was this recent (seconds)
+UPDATE_CACHE_TTL = 300
+
+# Help text printed for -h/--help; the first line doubles as the error usage line
+USAGE = f"""usage: install.py [-h] [--update] [--force-update]
+
+Install /dbapps and /dbtestrunner commands for Claude Code
+
+options:
+  -h, --help      show this help message and exit
+  --update        Pull latest changes from GitHub before installing
+  --force-update  Like --update, but pull even if the last update was under
+                  {UPDATE_CACHE_TTL // 60} minutes ago
+
+Examples:
+  python install.py           # Install the commands
+  python install.py --update  # Update from GitHub, then install
+  python install.py --force-update  # Update even if updated recently
+"""
+
+# ioctl request number for cloning a file's extents (Linux btrfs/xfs)
+FICLONE = 0x40049409
+
+# Terminal capabilities don't change mid-run, so decide on color once
+USE_COLOR = sys.platform != 'win32' or bool(os.getenv('TERM'))
+
+def print_colored(text, color, end="\n", file=None):
     """Print colored text if terminal supports it"""
-    if sys.platform != 'win32' or os.getenv('TERM'):
-        print(f"{color}{text}{NC}", end=end)
+    if USE_COLOR:
+        print(color + text + NC, end=end, file=file)
     else:
-        print(text, end=end)
+        print(text, end=end, file=file)
+
+def _zero_copy(src_path, dst_path, size):
+    """Copy size bytes in-kernel, falling back to a buffered userspace copy"""
+    with open(src_path, 'rb') as fsrc, open(dst_path, 'wb') as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        offset = 0
+
+        # copy_file_range lets NFS and CoW filesystems copy server-side
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while offset < size:
+                    sent = os.copy_file_range(src_fd, dst_fd, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+            except OSError as e:
+                # Give up on this strategy unless bytes were already written or the disk is full
+                if offset or e.errno == errno.ENOSPC:
+                    raise
+
+        # sendfile can only target regular files on Linux
+        if sys.platform.startswith('linux'):
+            try:
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                if offset >= size:
+                    return
+            except OSError as e:
+                # Give up on this strategy unless bytes were already written or the disk is full
+                if offset or e.errno == errno.ENOSPC:
+                    raise
+
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        shutil.copyfileobj(fsrc, fdst, length=COPY_BUFSIZE)
+
+def _try_reflink(src, dst):
+    """Clone src to dst on copy-on-write filesystems, returning True on success"""
+    try:
+        if sys.platform.startswith('linux') and fcntl is not None:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+
+        # Cloning would replace a symlinked destination instead of writing through it
+        if _clonefile is not None and not os.path.islink(dst):
+            # clonefile refuses to overwrite, so clone beside dst and swap it in
+            tmp_name = f".{os.path.basename(dst)}.{os.getpid()}.clone"
+            tmp = os.path.join(os.path.dirname(dst), tmp_name)
+            if _clonefile(os.fsencode(src), os.fsencode(tmp), 0) != 0:
+                return False
+            try:
+                os.replace(tmp, dst)
+            except OSError:
+                os.unlink(tmp)
+                raise
+            return True
+    except OSError:
+        pass
+    return False
+
+def fast_copy(src, dst, src_stat=None):
+    """Copy file contents and preserve metadata like copy2"""
+    if src_stat is None:
+        src_stat = os.stat(src)
+    if not _try_reflink(src, dst):
+        _zero_copy(src, dst, src_stat.st_size)
+    # copystat stats src again, but it also carries over xattrs and flags as copy2 does
+    shutil.copystat(src, dst)
+
+def _is_up_to_date(src_stat, dst_file):
+    """Check whether dst_file already matches the source size and mtime"""
+    try:
+        dst_stat = dst_file.stat()
+    except FileNotFoundError:
+        return False
+    return (dst_stat.st_size == src_stat.st_size
+            and int(dst_stat.st_mtime) == int(src_stat.st_mtime))
+
+def _copy_one(filename, commands_src, commands_dst):
+    """Copy a single command file, returning (filename, status)"""
+    src_file = commands_src / filename
+    dst_file = commands_dst / filename
+
+    try:
+        src_stat = src_file.stat()
+    except FileNotFoundError:
+        return filename, "missing"
+    if _is_up_to_date(src_stat, dst_file):
+        return filename, "up_to_date"
+    fast_copy(src_file, dst_file, src_stat)
+    return filename, "installed"
+
+def _update_cache_file(home, script_dir):
+    """Return the file recording when this checkout was last pulled successfully"""
+    checkout_key = hashlib.sha1(os.fsencode(script_dir.resolve())).hexdigest()[:16]
+    return home / ".cache" / "claude-dbapps" / f"last_pull-{checkout_key}"
 
-def update_from_repo(script_dir):
+def _read_last_pull(cache_file):
+    """Return the timestamp of the last successful pull, or None"""
+    try:
+        return float(cache_file.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+def _record_last_pull(cache_file):
+    """Remember when the last successful pull happened"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(str(time.time()))
+    except OSError:
+        pass
+
+def update_from_repo(script_dir, cache_file, force=False):
     """Pull latest changes from git repository"""
     print_colored("🔄 Updating from GitHub repository...", BLUE)
     print()
 
-    try:
-        # Check if this is a git repository
-        result = subprocess.run(
-            ["git", "rev-parse", "--git-dir"],
-            cwd=script_dir,
-            capture_output=True,
-            text=True,
-            check=False
-        )
+    last_pull = _read_last_pull(cache_file)
+    # A timestamp in the future (clock skew, restored cache) doesn't count as recent
+    if not force and last_pull is not None and 0 <= time.time() - last_pull < UPDATE_CACHE_TTL:
+        print_colored("✓ Recently updated, skipping fetch", GREEN)
+        print_colored("  Use --force-update to pull anyway", BLUE)
+        print()
+        return True
 
-        if result.returncode != 0:
+    try:
+        # Check if this is a git repository (.git is a file for submodules/worktrees)
+        if not (script_dir / ".git").exists():
             print_colored("⚠ Warning: Not a git repository. Skipping update.", YELLOW)
             print_colored("  To enable updates, clone from GitHub:", YELLOW)
             print("  git clone https://github.com/honnuanand/claude-dbapps-command.git")
             print()
             return False
 
-        # Pull latest changes
+        # Pull latest changes; fast-forward only and skip tags, which the installer never needs
         print_colored("Pulling latest changes...", BLUE)
+        # Let git write straight to the terminal so progress shows as it happens
+        sys.stdout.flush()
         result = subprocess.run(
-            ["git", "pull"],
+            ["git", "pull", "--ff-only", "--no-tags"],
             cwd=script_dir,
-            capture_output=True,
-            text=True,
             check=False
         )
 
         if result.returncode == 0:
+            _record_last_pull(cache_file)
             print_colored("✓ Successfully updated from GitHub", GREEN)
-            if "Already up to date" in result.stdout:
-                print_colored("  Repository is already up to date", BLUE)
             print()
             return True
         else:
-            print_colored(f"❌ Failed to update: {result.stderr}", YELLOW)
+            print_colored("❌ Failed to update from GitHub", YELLOW)
+            print()
             return False
 
     except FileNotFoundError:
@@ -78,18 +247,61 @@ def update_from_repo(script_dir):
         print()
         return False
 
-def install_files(script_dir):
-    """Install command files to ~/.claude/commands/"""
-    commands_src = script_dir / "commands"
-    commands_dst = Path.home() / ".claude" / "commands"
+def _print_summary(commands_dst, files_to_copy, installed_count, up_to_date_count, buf):
+    """Write the completion banner, command usage and install summary to buf"""
+    print(file=buf)
+    print_colored(BANNER45, GREEN, file=buf)
+    print_colored("Installation complete!", GREEN, file=buf)
+    print_colored(BANNER45, GREEN, file=buf)
+    print(file=buf)
+
+    print_colored("The following commands are now available in Claude Code!", BLUE, file=buf)
+    print(file=buf)
+
+    print_colored("Commands:", BLUE, file=buf)
+    print_colored("  /dbapps        ", GREEN, end="", file=buf)
+    print("- Create a React + FastAPI app with Databricks deployment", file=buf)
+    print_colored("  /dbtestrunner  ", GREEN, end="", file=buf)
+    print("- Add an in-app Test Runner framework to a Databricks App", file=buf)
+    print_colored("  /dbaiassistant ", GREEN, end="", file=buf)
+    print("- Add a Genie-powered AI assistant to your Databricks App", file=buf)
+    print_colored("  /dbgeniespaces ", GREEN, end="", file=buf)
+    print("- Analyze schemas and create comprehensive Genie spaces", file=buf)
+    print(file=buf)
+
+    print_colored("Usage:", BLUE, file=buf)
+    print("  1. Open Claude Code in any directory", file=buf)
+    print_colored("  2. Type: /dbapps", GREEN, end="", file=buf)
+    print(" to create a new Databricks App", file=buf)
+    print_colored("  3. Type: /dbtestrunner", GREEN, end="", file=buf)
+    print(" to add an in-app test runner", file=buf)
+    print_colored("  4. Type: /dbaiassistant", GREEN, end="", file=buf)
+    print(" to add a Genie-powered AI assistant", file=buf)
+    print_colored("  5. Type: /dbgeniespaces", GREEN, end="", file=buf)
+    print(" to analyze and create Genie spaces", file=buf)
+    print(file=buf)
+
+    print_colored("Files installed to:", BLUE, file=buf)
+    for filename in files_to_copy:
+        print(f"  {commands_dst / filename}", file=buf)
+    print(file=buf)
+
+    summary = f"✓ Successfully installed {installed_count} file(s)"
+    if up_to_date_count:
+        summary += f", {up_to_date_count} already up to date"
+    print_colored(summary, GREEN, file=buf)
 
+def _install_files(commands_src, commands_dst, buf):
+    """Copy command files and write progress and the summary to buf"""
     # Create .claude/commands directory if it doesn't exist
-    if not commands_dst.exists():
-        print_colored(f"Creating {commands_dst}...", YELLOW)
-        commands_dst.mkdir(parents=True, exist_ok=True)
+    try:
+        commands_dst.mkdir(parents=True)
+        print_colored(f"Created {commands_dst}", YELLOW, file=buf)
+    except FileExistsError:
+        pass
 
     # Copy command files
-    print_colored("Copying command files...", BLUE)
+    print_colored("Copying command files...", BLUE, file=buf)
 
     files_to_copy = [
         "dbapps.md",
@@ -99,92 +311,81 @@ def install_files(script_dir):
         "deploy_to_databricks_template.py"
     ]
 
-    success_count = 0
-    for filename in files_to_copy:
-        src_file = commands_src / filename
-        dst_file = commands_dst / filename
+    # Copies are independent I/O, so overlap them and report in order afterwards
+    with ThreadPoolExecutor(max_workers=len(files_to_copy)) as executor:
+        futures = [
+            executor.submit(_copy_one, filename, commands_src, commands_dst)
+            for filename in files_to_copy
+        ]
 
-        if src_file.exists():
-            shutil.copy2(src_file, dst_file)
-            print_colored(f"✓ Installed {filename}", GREEN)
-            success_count += 1
-        else:
-            print_colored(f"⚠ Warning: {filename} not found", YELLOW)
+    installed_count = 0
+    up_to_date_count = 0
+    first_error = None
+    for filename, future in zip(files_to_copy, futures):
+        try:
+            _, status = future.result()
+        except OSError as e:
+            print_colored(f"❌ Failed to install {filename}: {e}", YELLOW, file=buf)
+            first_error = first_error or e
+            continue
 
-    print()
-    print_colored("=" * 45, GREEN)
-    print_colored("Installation complete!", GREEN)
-    print_colored("=" * 45, GREEN)
-    print()
+        if status == "installed":
+            print_colored(f"✓ Installed {filename}", GREEN, file=buf)
+            installed_count += 1
+        elif status == "up_to_date":
+            print_colored(f"✓ Up to date {filename}", GREEN, file=buf)
+            up_to_date_count += 1
+        else:
+            print_colored(f"⚠ Warning: {filename} not found", YELLOW, file=buf)
 
-    print_colored("The following commands are now available in Claude Code!", BLUE)
-    print()
+    # Report every file before giving up, so the user knows what was installed
+    if first_error is not None:
+        raise first_error
 
-    print_colored("Commands:", BLUE)
-    print_colored("  /dbapps        ", GREEN, end="")
-    print("- Create a React + FastAPI app with Databricks deployment")
-    print_colored("  /dbtestrunner  ", GREEN, end="")
-    print("- Add an in-app Test Runner framework to a Databricks App")
-    print_colored("  /dbaiassistant ", GREEN, end="")
-    print("- Add a Genie-powered AI assistant to your Databricks App")
-    print_colored("  /dbgeniespaces ", GREEN, end="")
-    print("- Analyze schemas and create comprehensive Genie spaces")
-    print()
+    _print_summary(commands_dst, files_to_copy, installed_count, up_to_date_count, buf)
 
-    print_colored("Usage:", BLUE)
-    print("  1. Open Claude Code in any directory")
-    print_colored("  2. Type: /dbapps", GREEN, end="")
-    print(" to create a new Databricks App")
-    print_colored("  3. Type: /dbtestrunner", GREEN, end="")
-    print(" to add an in-app test runner")
-    print_colored("  4. Type: /dbaiassistant", GREEN, end="")
-    print(" to add a Genie-powered AI assistant")
-    print_colored("  5. Type: /dbgeniespaces", GREEN, end="")
-    print(" to analyze and create Genie spaces")
-    print()
+def install_files(commands_src, commands_dst):
+    """Install command files from commands_src to commands_dst (~/.claude/commands/)"""
+    # Collect output and write it in one go, even if installation fails part way
+    buf = io.StringIO()
+    try:
+        _install_files(commands_src, commands_dst, buf)
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
 
-    print_colored("Files installed to:", BLUE)
-    for filename in files_to_copy:
-        print(f"  {commands_dst / filename}")
-    print()
+def main():
+    args = sys.argv[1:]
+    if "-h" in args or "--help" in args:
+        print(USAGE, end="")
+        return
+    unknown = [arg for arg in args if arg not in ("--update", "--force-update")]
+    if unknown:
+        print(USAGE.splitlines()[0], file=sys.stderr)
+        print(f"install.py: error: unrecognized arguments: {' '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
 
-    print_colored(f"✓ Successfully installed {success_count} file(s)", GREEN)
+    force_update = "--force-update" in args
+    update = "--update" in args or force_update
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Install /dbapps and /dbtestrunner commands for Claude Code",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python install.py           # Install the commands
-  python install.py --update  # Update from GitHub, then install
-        """
-    )
-    parser.add_argument(
-        "--update",
-        action="store_true",
-        help="Pull latest changes from GitHub before installing"
-    )
-
-    args = parser.parse_args()
-
-    print_colored("=" * 50, BLUE)
-    if args.update:
+    print_colored(BANNER50, BLUE)
+    if update:
         print_colored("Updating and Installing Databricks App commands", BLUE)
     else:
         print_colored("Installing Databricks App commands for Claude Code", BLUE)
-    print_colored("=" * 50, BLUE)
+    print_colored(BANNER50, BLUE)
     print()
 
     # Get the directory where this script is located
     script_dir = Path(__file__).parent
+    home = Path.home()
 
     # Update from repo if requested
-    if args.update:
-        update_from_repo(script_dir)
+    if update:
+        update_from_repo(script_dir, _update_cache_file(home, script_dir), force=force_update)
 
     # Install files
-    install_files(script_dir)
+    install_files(script_dir / "commands", home / ".claude" / "commands")
 
 if __name__ == "__main__":
     try: